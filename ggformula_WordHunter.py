@@ -1,31 +1,97 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import sqlite3
+import pickle
+import hashlib
+import threading
+import xlsxwriter
+from functools import partial
 from io import BytesIO
 from pathlib import Path
 from deep_translator import GoogleTranslator
 from nltk.corpus import wordnet
+from nltk.corpus import words as nltk_words
 import nltk
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib import colors
 
 # --- NLTK setup ---
-try: nltk.data.find('corpora/wordnet')
-except LookupError: nltk.download('wordnet')
-try: nltk.data.find('corpora/omw-1.4')
-except LookupError: nltk.download('omw-1.4')
-try: nltk.data.find('corpora/words')
-except LookupError: nltk.download('words')
+# Streamlit re-executes this script on every interaction; cache_resource makes the corpus check once per process.
+@st.cache_resource(show_spinner=False)
+def ensure_nltk_data():
+    # Local lookup first; nltk.download would otherwise fetch the remote index even when data is present.
+    for corpus in ('wordnet', 'omw-1.4', 'words'):
+        try: nltk.data.find(f'corpora/{corpus}')
+        except LookupError: nltk.download(corpus, quiet=True)
+    # The lazy corpus loader is not thread-safe; load WordNet here so no worker or deferred download callable races it.
+    wordnet.ensure_loaded()
+    return True
 
-from nltk.corpus import words as nltk_words
+ensure_nltk_data()
 
 # --- Page setup ---
 st.set_page_config(page_title="Word Suffix Finder", layout="wide")
 CACHE_DIR = Path("data"); CACHE_DIR.mkdir(exist_ok=True)
 POS_MAP = {'n':'Noun','v':'Verb','a':'Adjective','s':'Adjective (Satellite)','r':'Adverb'}
 
+# --- Shared worker pools ---
+# Created once per process instead of per call. Word lookups run on word_pool and submit their
+# HTTP calls to http_pool; keeping the two separate means a word task never waits on its own pool.
+@st.cache_resource(show_spinner=False)
+def http_pool():
+    return ThreadPoolExecutor(max_workers=16, thread_name_prefix="http")
+
+@st.cache_resource(show_spinner=False)
+def word_pool():
+    return ThreadPoolExecutor(max_workers=12, thread_name_prefix="words")
+
+@st.cache_resource(show_spinner=False)
+def pdf_pool():
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf")
+
+# One keep-alive connection pool per host, sized to http_pool so no worker waits for a socket.
+# Throttling (429) and transient 5xx replies get a short backoff retry instead of falling straight to "-".
+@st.cache_resource(show_spinner=False)
+def http_session():
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429,500,502,503,504], respect_retry_after_header=False)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    return session
+
+# --- Persistent translation cache ---
+@st.cache_resource(show_spinner=False)
+def tamil_db():
+    conn = sqlite3.connect(CACHE_DIR/"tamil_cache.db", check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS t(k TEXT PRIMARY KEY, v TEXT)")
+    return conn, threading.Lock()
+
+def cached_translations(texts):
+    found = {}
+    keys = list(dict.fromkeys(texts))
+    _tamil_db, _tamil_db_lock = tamil_db()
+    with _tamil_db_lock:
+        for i in range(0, len(keys), 900):  # stay under SQLite's bound-parameter limit
+            part = keys[i:i+900]
+            q = f"SELECT k, v FROM t WHERE k IN ({','.join('?'*len(part))})"
+            found.update(_tamil_db.execute(q, part).fetchall())
+    return found
+
+def store_translations(pairs):
+    pairs = [(k, v) for k, v in pairs if k and v and v != "-"]
+    if not pairs: return
+    _tamil_db, _tamil_db_lock = tamil_db()
+    with _tamil_db_lock:
+        _tamil_db.executemany("INSERT OR REPLACE INTO t(k, v) VALUES (?, ?)", pairs)
+        _tamil_db.commit()
+
 # --- CSS styling ---
 st.markdown("""
 <style>
@@ -37,11 +103,24 @@ body { font-family: 'Roboto', sans-serif; }
 """, unsafe_allow_html=True)
 
 # --- Translation ---
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False)
+def translator_slots():
+    return threading.local()
+
+def tamil_translator():
+    # GoogleTranslator keeps per-request params on the instance, so reuse one per worker thread.
+    slots = translator_slots()
+    if not hasattr(slots, "tr"): slots.tr = GoogleTranslator(source='auto', target='ta')
+    return slots.tr
+
+@st.cache_data(show_spinner=False, ttl="7d", max_entries=5000)
 def translate_to_tamil(text:str):
     if not text: return "-"
+    known = cached_translations([text])
+    if text in known: return known[text]
     try:
-        out = GoogleTranslator(source='auto', target='ta').translate(text)
+        out = tamil_translator().translate(text)
+        store_translations([(text, out)])
         return out if out else "-"
     except Exception:
         return "-"
@@ -50,70 +129,189 @@ def google_public_translate(text: str) -> str:
     if not text: return "-"
     try:
         params = {"client":"gtx","sl":"auto","tl":"ta","dt":"t","q":text}
-        r = requests.get("https://translate.googleapis.com/translate_a/single", params=params, timeout=8)
+        r = http_session().get("https://translate.googleapis.com/translate_a/single", params=params, timeout=8)
         r.raise_for_status()
         data = r.json()
         return "".join(chunk[0] for chunk in data[0]) or "-"
     except Exception:
         return "-"
 
-def translate_list_parallel(texts, max_workers=12):
-    results = [None]*len(texts)
-    with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futs = {ex.submit(translate_to_tamil, t): i for i, t in enumerate(texts)}
+TRANSLATE_CHUNK_CHARS = 4500  # GoogleTranslator rejects payloads over 5000 chars
+
+def chunk_texts(texts, limit=TRANSLATE_CHUNK_CHARS):
+    chunk, size = [], 0
+    for t in texts:
+        if chunk and size + len(t) + 1 > limit:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(t); size += len(t) + 1
+    if chunk: yield chunk
+
+def translate_batch(chunk):
+    # One HTTP round-trip per chunk: join on newlines and split the reply back apart.
+    joined = "\n".join(" ".join(t.split()) for t in chunk)
+    try:
+        out = tamil_translator().translate(joined) or ""
+        parts = out.split("\n")
+        if len(parts) == len(chunk): return [p.strip() or "-" for p in parts]
+    except Exception:
+        pass
+    return [translate_to_tamil(t) for t in chunk]
+
+# Not st.cache_data: a cached list would pin the "-" of a failed call; the SQLite lookup already makes repeats cheap.
+def translate_list_parallel(texts):
+    # Each distinct text is translated once; duplicates are filled back in from the map.
+    todo = list(dict.fromkeys(t for t in texts if t and t.strip()))
+    tam = cached_translations(todo)
+    todo = [t for t in todo if t not in tam]
+    chunks = list(chunk_texts(todo))
+    for chunk, part in zip(chunks, http_pool().map(translate_batch, chunks)):
+        tam.update(zip(chunk, part))
+    need = [t for t in todo if not tam.get(t) or tam[t] == "-"]
+    if need:
+        futs = {http_pool().submit(google_public_translate, t): t for t in need}
         for f in as_completed(futs):
-            i = futs[f]
+            t = futs[f]
             try:
-                results[i] = f.result()
+                fb = f.result()
+                tam[t] = fb if fb else "-"
             except Exception:
-                results[i] = "-"
-    need = [i for i, t in enumerate(results) if (not t) or t == "-"]
-    if need:
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            futs = {ex.submit(google_public_translate, texts[i]): i for i in need}
-            for f in as_completed(futs):
-                i = futs[f]
-                try:
-                    fb = f.result()
-                    results[i] = fb if fb else "-"
-                except Exception:
-                    results[i] = "-"
-    return results
+                tam[t] = "-"
+    store_translations((t, tam[t]) for t in todo)
+    return [tam.get(t) or "-" for t in texts]
 
 # --- Word lists ---
-@st.cache_data(show_spinner=False)
+WORDS_PICKLE = CACHE_DIR/"all_words.pkl"
+WORD_SOURCES = [Path("data/custom_words.txt"), Path("data/large_words.txt")]
+# Bump whenever get_all_words' build logic (built-in lists, filter, sort key) or the NLTK corpora change;
+# the file stats below only catch edits to the two text sources.
+WORDS_BUILD_VERSION = 1
+
+def word_sources_signature():
+    return (WORDS_BUILD_VERSION,) + tuple((str(f), f.stat().st_mtime_ns, f.stat().st_size) if f.exists() else (str(f), None, None) for f in WORD_SOURCES)
+
+# cache_resource: the ~150k-word tuple is shared read-only, not copied and hashed on every access
+@st.cache_resource(show_spinner=False)
 def get_all_words():
+    sig = word_sources_signature()
+    if WORDS_PICKLE.exists():
+        try:
+            cached = pickle.loads(WORDS_PICKLE.read_bytes())
+            if cached.get("sig") == sig: return tuple(cached["words"])
+        except Exception:
+            pass
     wordnet_words = set(wordnet.all_lemma_names())
     extra_words = set(w.lower() for w in nltk_words.words())
     dolch_words = set(["a","and","away","big","blue","can","come","down","find","for","funny","go","help","here","I","in","is","it","jump","little","look","make","me","my","not","one","play","red","run","said","see","the","three","to","up","we","where","yellow","you"])
-    custom_file = Path("data/custom_words.txt")
+    custom_file, large_file = WORD_SOURCES
     custom_words = set()
     if custom_file.exists(): custom_words = set(custom_file.read_text(encoding="utf-8", errors="ignore").splitlines())
-    large_file = Path("data/large_words.txt")
     large_words = set()
     if large_file.exists(): large_words = set(large_file.read_text(encoding="utf-8", errors="ignore").splitlines())
     merged = wordnet_words.union(extra_words).union(dolch_words).union(custom_words).union(large_words)
     cleaned = {str(x).strip() for x in merged if str(x).strip() and str(x).strip().isascii()}
-    return sorted(cleaned, key=lambda x:(len(x), x.lower()))
-
-def find_matches(words, suffix, before_letters):
-    suf = (suffix or "").lower().strip()
-    if not suf: return []
-    matched = []
-    for w in words:
-        wl = w.lower()
-        if wl.endswith(suf):
-            if before_letters == 0 or len(wl) - len(suf) == before_letters:
-                matched.append(w)
-    matched.sort(key=len)
-    return matched
+    words = tuple(sorted(cleaned, key=lambda x:(len(x), x.lower())))
+    try: WORDS_PICKLE.write_bytes(pickle.dumps({"sig": sig, "words": words}, protocol=5))
+    except OSError: pass
+    return words
+
+SWAR_WIDTH = 8  # letters per uint64 word
+
+@st.cache_resource(show_spinner=False)
+def get_word_tails():
+    # Right-aligned ASCII byte matrix of the lowercased words: row i ends with words[i].
+    words = get_all_words()
+    lens = np.fromiter(map(len, words), dtype=np.int32, count=len(words))
+    width = max(int(lens.max()) if len(words) else 0, SWAR_WIDTH)
+    # words are ASCII-only, so lowercasing the joined text keeps every offset valid
+    buf = np.frombuffer("".join(words).lower().encode("ascii"), dtype=np.uint8)
+    rows = np.repeat(np.arange(len(words)), lens)
+    starts = np.repeat(np.cumsum(lens) - lens, lens)
+    cols = np.arange(len(buf)) - starts + np.repeat(width - lens, lens)
+    tails = np.zeros((len(words), width), dtype=np.uint8)
+    tails[rows, cols] = buf
+    return tails, lens
+
+SUFFIX_INDEX_DEPTH = 3
+
+def tail_codes(tails, k):
+    # Big-endian integer of the last k bytes of each row; short words keep their zero padding.
+    codes = np.zeros(len(tails), dtype=np.uint64)
+    for j in range(k): codes = (codes << np.uint64(8)) | tails[:, j-k]
+    return codes
+
+@st.cache_resource(show_spinner=False)
+def get_tail_words():
+    # Last SWAR_WIDTH letters of every word packed into one uint64, so a suffix of up to
+    # SWAR_WIDTH letters is checked with a single masked integer compare per word.
+    tails, _ = get_word_tails()
+    return tail_codes(tails, SWAR_WIDTH)
+
+SUFFIX_INDEX_PICKLE = CACHE_DIR/"suffix_index.pkl"
+
+@st.cache_resource(show_spinner=False)
+def get_suffix_index():
+    # {(k, code of the last k letters): ascending row indices} for k = 1..SUFFIX_INDEX_DEPTH,
+    # pickled next to all_words.pkl and keyed on a digest of the word list itself, since its row
+    # numbers are only valid for exactly that list (a same-length change would otherwise slip through).
+    words_digest = hashlib.blake2b("\n".join(get_all_words()).encode(), digest_size=16).hexdigest()
+    sig = (words_digest, SUFFIX_INDEX_DEPTH)
+    if SUFFIX_INDEX_PICKLE.exists():
+        try:
+            cached = pickle.loads(SUFFIX_INDEX_PICKLE.read_bytes())
+            if cached.get("sig") == sig: return cached["index"]
+        except Exception:
+            pass
+    tails, _ = get_word_tails()
+    index = {}
+    for k in range(1, min(SUFFIX_INDEX_DEPTH, tails.shape[1])+1):
+        codes = tail_codes(tails, k)
+        order = np.argsort(codes, kind="stable")
+        keys, starts = np.unique(codes[order], return_index=True)
+        for key, bucket in zip(keys.tolist(), np.split(order, starts[1:])):
+            index[(k, key)] = bucket
+    try: SUFFIX_INDEX_PICKLE.write_bytes(pickle.dumps({"sig": sig, "index": index}, protocol=5))
+    except OSError: pass
+    return index
+
+def suffix_rows(suf, before_letters):
+    # Ascending row indices of the words ending in suf (already lowercased, ASCII).
+    tails, lens = get_word_tails()
+    if len(suf) > tails.shape[1]: return np.empty(0, dtype=np.intp)
+    suf_bytes = np.frombuffer(suf.encode("ascii"), dtype=np.uint8)
+    k = min(len(suf), SUFFIX_INDEX_DEPTH)
+    idx = get_suffix_index().get((k, int.from_bytes(suf_bytes[-k:].tobytes(), "big")))
+    if idx is None: return np.empty(0, dtype=np.intp)
+    if before_letters:
+        # Rows are sorted by length, so one length is a contiguous row range: bisect instead of masking.
+        lo, hi = np.searchsorted(lens, [before_letters + len(suf), before_letters + len(suf) + 1])
+        idx = idx[np.searchsorted(idx, lo):np.searchsorted(idx, hi)]
+    if len(suf) > SWAR_WIDTH:
+        idx = idx[(tails[idx, -len(suf):] == suf_bytes).all(axis=1)]
+    elif len(suf) > k:
+        mask = np.uint64((1 << 8*len(suf)) - 1)
+        idx = idx[(get_tail_words()[idx] & mask) == np.uint64(int.from_bytes(suf_bytes.tobytes(), "big"))]
+    return idx
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def find_matches(suffix, before_letters):
+    # Several suffixes may be given, separated by commas; each is a bucket lookup and the
+    # sorted row sets are merged, so no pass over the whole word list is needed.
+    sufs = {s.strip() for s in (suffix or "").lower().split(",") if s.strip()}
+    sufs = [s for s in sufs if s.isascii()]
+    if not sufs: return ()
+    words = get_all_words()
+    idx = suffix_rows(sufs[0], before_letters)
+    for suf in sufs[1:]: idx = np.union1d(idx, suffix_rows(suf, before_letters))
+    # words are sorted by (length, word), so ascending row indices are already length-ordered
+    return tuple(words[i] for i in idx)
 
 # --- Dictionaries ---
-@st.cache_data(show_spinner=False)
+@st.cache_data(show_spinner=False, ttl="7d", max_entries=5000)
 def dictionaryapi_lookup(word: str):
     url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
     try:
-        r = requests.get(url, timeout=10)
+        r = http_session().get(url, timeout=10)
         if r.status_code != 200: return {}
         data = r.json()
         defs, syns = [], set()
@@ -126,11 +324,11 @@ def dictionaryapi_lookup(word: str):
     except Exception:
         return {}
 
-@st.cache_data(show_spinner=False)
+@st.cache_data(show_spinner=False, ttl="7d", max_entries=5000)
 def wiktionary_lookup(word: str):
     try:
         params = {"action":"parse","page":word,"prop":"wikitext","format":"json"}
-        r = requests.get("https://en.wiktionary.org/w/api.php", params=params, timeout=10)
+        r = http_session().get("https://en.wiktionary.org/w/api.php", params=params, timeout=10)
         if r.status_code != 200: return {}
         data = r.json()
         wt = data.get("parse", {}).get("wikitext", {}).get("*", "")
@@ -147,139 +345,224 @@ def wiktionary_lookup(word: str):
     except Exception:
         return {}
 
-@st.cache_data(show_spinner=False)
+# Each rerun re-executes this module, so the memo has to live in Streamlit's cache to outlast it.
+@st.cache_data(show_spinner=False, max_entries=100_000)
 def wordnet_info(word: str):
     synsets = wordnet.synsets(word)
-    out_defs, out_syns, out_pos = [], set(), set()
+    out_defs, out_syns, out_pos = [], {}, set()
+    wl = word.replace("_"," ").lower()
     for s in synsets:
         out_defs.append(s.definition())
         out_pos.add(s.pos())
-        for lemma in s.lemmas():
-            out_syns.add(lemma.name().replace("_"," "))
+        # lemma_names() skips building Lemma objects; key on the spaced lowercase form so case variants
+        # and the word itself collapse, including multi-word entries such as "ice cream" (ice_cream).
+        for name in s.lemma_names():
+            syn = name.replace("_"," ")
+            if (k := syn.lower()) != wl and k not in out_syns: out_syns[k] = syn
     pos_list = sorted({POS_MAP.get(p, p) for p in out_pos}) if out_pos else []
-    return {"definitions": list(dict.fromkeys(out_defs)), "synonyms": sorted(out_syns), "pos": pos_list}
+    return {"definitions": list(dict.fromkeys(out_defs)), "synonyms": sorted(out_syns.values()), "pos": pos_list}
 
-def aggregate_meanings(word: str):
+def aggregate_meanings(word: str, wn: dict):
     agg_defs, agg_syns, pos_list = [], set(), []
-    wn = wordnet_info(word)
     if wn["definitions"]:
         agg_defs.extend(wn["definitions"])
         agg_syns |= set(wn["synonyms"])
         pos_list = wn["pos"]
 
-    tasks = []
-    with ThreadPoolExecutor(max_workers=2) as ex:
-        tasks.append(ex.submit(dictionaryapi_lookup, word))
-        tasks.append(ex.submit(wiktionary_lookup, word))
-        for fut in as_completed(tasks):
-            info = fut.result() or {}
-            if info.get("definitions"):
-                agg_defs.extend(info["definitions"])
-            for s in info.get("synonyms", []):
-                agg_syns.add(s)
+    # Wiktionary is the slowest source, so only ask it for words WordNet knows nothing about.
+    lookups = (dictionaryapi_lookup,) if wn["definitions"] else (dictionaryapi_lookup, wiktionary_lookup)
+    tasks = [http_pool().submit(f, word) for f in lookups]
+    for fut in tasks:
+        info = fut.result() or {}
+        if info.get("definitions"):
+            agg_defs.extend(info["definitions"])
+        for s in info.get("synonyms", []):
+            agg_syns.add(s)
 
     agg_defs = list(dict.fromkeys([d.strip() for d in agg_defs if d and d.strip()]))
     return {"definitions": agg_defs, "synonyms": sorted(agg_syns), "pos": pos_list}
 
+# --- Definitions table ---
+def build_record(word, wn):
+    info = aggregate_meanings(word, wn)
+    pos = ", ".join(p) if (p := info.get("pos")) else "-"
+    syns = ", ".join(sy) if (sy := info.get("synonyms")) else "-"
+    return (word, pos, info.get("definitions") or ["-"], syns)
+
+# cache_resource skips hashing the returned frames on every rerun; callers take a .copy() before editing.
+@st.cache_resource(show_spinner=False, ttl="1h", max_entries=64)
+def build_english_df(words):
+    # WordNet lookups are CPU-bound and hold the GIL, so threads cannot overlap them. Resolve them
+    # here rather than in the pools (the corpus is already loaded by ensure_nltk_data, so this is
+    # also safe from the Excel download callable) and hand the results on for the network lookups.
+    wn_infos = [wordnet_info(w) for w in words]
+    records = list(word_pool().map(build_record, words, wn_infos))
+
+    # One record per word; explode fans the definition lists out to one row each.
+    df_export = pd.DataFrame.from_records(records, columns=["Word","Word Type","English","Synonyms"]).explode("English", ignore_index=True)
+    df_export.insert(3, "Tamil", np.where(df_export["English"].eq("-"), "-", ""))
+    return df_export
+
+# Streamlit stores nothing for a call that raises, so a cached builder whose Tamil column still has
+# failed translations ("-" beside a real gloss) raises this with its result: the caller gets the
+# frame, and the next rerun retries the failed strings instead of serving "-" for the cache lifetime.
+class IncompleteTamil(Exception):
+    def __init__(self, result):
+        super().__init__("Tamil translations incomplete")
+        self.result = result
+
+def has_failed_translations(df):
+    return bool((df["Tamil"].eq("-") & df["English"].ne("-")).any())
+
+def unless_incomplete(cached_builder, *args):
+    try: return cached_builder(*args)
+    except IncompleteTamil as e: return e.result
+
+@st.cache_resource(show_spinner=False, ttl="1h", max_entries=64)
+def build_definitions_df(words, lang_choice):
+    # Switching language reuses the cached English frame and only adds the Tamil column.
+    df_export = build_english_df(words)
+    if lang_choice not in ["Tamil Only","English + Tamil"]: return df_export
+    df_export = df_export.copy()
+    eng_defs = df_export["English"].fillna("").astype(str)
+    unique_defs = [d for d in eng_defs.unique().tolist() if d != "-"]
+    tam_map = dict(zip(unique_defs, translate_list_parallel(unique_defs)))
+    df_export["Tamil"] = eng_defs.map(lambda e: tam_map.get(e, "-"))
+    if has_failed_translations(df_export): raise IncompleteTamil(df_export)
+    return df_export
+
+# --- Excel export ---
+EXPORT_MAX_WORDS = 1000  # every exported word costs dictionary lookups and, with Tamil, translations
+def xlsx_bytes(df, sheet_name="Meanings"):
+    # Rows are written strictly in order, which is what lets xlsxwriter run in constant_memory mode
+    # (DataFrame.to_excel writes column by column and loses cells there).
+    buf = BytesIO()
+    wb = xlsxwriter.Workbook(buf, {"constant_memory": True, "strings_to_urls": False})
+    ws = wb.add_worksheet(sheet_name)
+    ws.write_row(0, 0, df.columns.tolist())
+    for r, row in enumerate(df.fillna("").itertuples(index=False, name=None), start=1):
+        ws.write_row(r, 0, row)
+    wb.close()
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False, ttl="1h", max_entries=32)
+def definitions_xlsx(words, lang_choice):
+    # Same key and TTL as build_definitions_df, so an unchanged match list reuses the workbook bytes on
+    # every rerun; a workbook with failed translations is handed back through IncompleteTamil, uncached.
+    df = unless_incomplete(build_definitions_df, words, lang_choice)
+    data = xlsx_bytes(df.drop(columns=["Sources"], errors="ignore"))
+    if has_failed_translations(df): raise IncompleteTamil(data)
+    return data
+
 # --- PDF tracer generator ---
-def create_tracer_pdf_buffer(words):
+# Page geometry is fixed, so the six word slots per page and the clone offsets are computed once.
+PAGE_W, PAGE_H = A4
+TRACER_MARGIN = 50; TRACER_COL_GAP = 40
+TRACER_COL_W = (PAGE_W - 2*TRACER_MARGIN - TRACER_COL_GAP)/2
+TRACER_FONT = "Helvetica-Bold"; TRACER_FONT_SIZE = 28
+TRACER_CLONES = 5; TRACER_LINE_HEIGHT = 40; TRACER_CLONE_GAP = 10
+TRACER_BLOCK_H = TRACER_FONT_SIZE + (TRACER_FONT_SIZE+TRACER_CLONE_GAP)*TRACER_CLONES + 60
+TRACER_WORDS_PER_PAGE = 6
+TRACER_MAX_WORDS = 300  # 50 pages; bounds the worst case when a whole match list is pasted in
+TRACER_SLOTS = [(TRACER_MARGIN + (k%2)*(TRACER_COL_W+TRACER_COL_GAP), PAGE_H - TRACER_MARGIN - (k//2)*TRACER_BLOCK_H) for k in range(TRACER_WORDS_PER_PAGE)]
+TRACER_CLONE_OFFSETS = [TRACER_LINE_HEIGHT + k*(TRACER_FONT_SIZE+TRACER_CLONE_GAP) for k in range(TRACER_CLONES)]
+
+def draw_tracer_underlines(c, segments):
+    # All dashed underlines of a page go out in one lines() call with a single dash/colour state.
+    if not segments: return
+    c.setDash(3,3); c.setStrokeColor(colors.lightgrey)
+    c.lines(segments); c.setDash()
+
+def create_tracer_pdf_buffer(words, on_progress=None):
     buf = BytesIO()
     c = canvas.Canvas(buf, pagesize=A4)
-    page_w, page_h = A4
-    left_margin = right_margin = 50; top_margin = bottom_margin = 50
-    usable_w = page_w - left_margin - right_margin
-    col_gap = 40; col_w = (usable_w - col_gap)/2; x_cols = [left_margin, left_margin+col_w+col_gap]
-    font_main = "Helvetica-Bold"; font_clone = font_main
-    font_size_main = 28; font_size_clone = 28
-    clones_per_word = 5; line_height = 40; clone_gap = 10
-    block_height = font_size_main + (font_size_clone+clone_gap)*clones_per_word + 60
-    y_start_orig = page_h - top_margin; count_on_page = 0; y_start = y_start_orig
-
+    underlines = []
     for idx, word in enumerate(words):
-        if count_on_page==0 and idx>0: c.showPage(); y_start=y_start_orig
-        col = count_on_page%2
-        if col==0 and count_on_page>0: y_start-=block_height
-        x = x_cols[col]
-        c.setFont(font_main,font_size_main); c.setFillColor(colors.black)
-        c.drawCentredString(x+col_w/2, y_start, word)
-        c.setFont(font_clone,font_size_clone); c.setFillColor(colors.lightgrey)
-        y_clone=y_start-line_height
-        for _ in range(clones_per_word):
-            c.drawCentredString(x+col_w/2, y_clone, word)
-            underline_y = y_clone-6; c.setDash(3,3); c.setStrokeColor(colors.lightgrey)
-            c.line(x+4,underline_y,x+col_w-4,underline_y); c.setDash()
-            y_clone-=(font_size_clone+clone_gap)
-        count_on_page+=1
-        if count_on_page>=6: count_on_page=0
+        if on_progress: on_progress(idx)
+        slot = idx % TRACER_WORDS_PER_PAGE
+        if slot==0 and idx>0:
+            draw_tracer_underlines(c, underlines); underlines = []
+            c.showPage()
+        x, y_start = TRACER_SLOTS[slot]
+        # Model and clones share one font, so measure the word once and left-align at the centred x.
+        x_text = x+TRACER_COL_W/2 - stringWidth(word, TRACER_FONT, TRACER_FONT_SIZE)/2
+        c.setFont(TRACER_FONT,TRACER_FONT_SIZE); c.setFillColor(colors.black)
+        c.drawString(x_text, y_start, word)
+        c.setFillColor(colors.lightgrey)
+        for off in TRACER_CLONE_OFFSETS:
+            y_clone = y_start-off
+            c.drawString(x_text, y_clone, word)
+            underlines.append((x+4,y_clone-6,x+TRACER_COL_W-4,y_clone-6))
+    draw_tracer_underlines(c, underlines)
 
     c.save(); buf.seek(0); return buf
 
-# --- UI ---
-st.markdown("<div class='app-header'><h1 style='margin:0'>BRAIN-CHILD DICTIONARY</h1><small>Learn spellings and master words with suffixes and meanings</small></div>", unsafe_allow_html=True)
+TRACER_PDF_CACHE_SIZE = 32
 
-with st.container():
-    st.markdown("<div class='main-container'>", unsafe_allow_html=True)
-    col1,col2 = st.columns(2,gap="large")
+# Finished PDFs keyed on the word tuple, so repeat clicks reuse the bytes. A plain dict rather than
+# st.cache_data: the build reports progress to the page, and a cached function may not touch
+# elements created outside it (a cache hit would try to replay those calls and fail).
+@st.cache_resource(show_spinner=False)
+def tracer_pdf_cache():
+    return {}, threading.Lock()
 
-    # --- Find Words ---
-    with col1:
-        st.subheader("🔎 Find Words")
-        with st.form("find_words_form"):
-            suffix_input = st.text_input("Suffix (e.g., 'ight')", value="ight")
-            before_letters = st.number_input("Letters Before Suffix (0 for any number)", min_value=0, step=1, value=0)
-            submit_button = st.form_submit_button("Apply")
-            if submit_button:
-                all_words = get_all_words()
-                matches = find_matches(all_words, suffix_input, before_letters)
-                st.session_state['matches']=matches; st.session_state['search_triggered']=True
-                st.markdown(f"**Total Words Found:** {len(matches)}")
-                if matches: st.dataframe(pd.DataFrame(matches,columns=["Word"]),height=450,use_container_width=True)
-                else: st.info("No results found.")
+def cached_tracer_pdf(words):
+    cache, lock = tracer_pdf_cache()
+    with lock: return cache.get(words)
 
-    # --- Word Tracer PDF ---
-    with col2:
-        st.subheader("📝 Word Tracer Generator")
-        if st.session_state.get('search_triggered') and 'matches' in st.session_state:
-            words_input = st.text_area("Enter words for practice (one per line):", value="\n".join(st.session_state['matches']), height=150)
-        else:
-            words_input = st.text_area("Enter words for practice (one per line):", height=150)
-        if st.button("Generate PDF"):
-            words_for_tracer = [w.strip() for w in words_input.split('\n') if w.strip()]
-            if words_for_tracer:
-                pdf_data = create_tracer_pdf_buffer(words_for_tracer)
-                st.download_button("Download Practice Sheet as PDF", data=pdf_data, file_name="word_tracer_sheet.pdf", mime="application/pdf")
+def store_tracer_pdf(words, data):
+    cache, lock = tracer_pdf_cache()
+    with lock:
+        cache[words] = data
+        while len(cache) > TRACER_PDF_CACHE_SIZE: cache.pop(next(iter(cache)))
 
-    st.markdown("---")
+# --- UI ---
+# The tracer and definitions panels are fragments: their widgets rerun only their own panel,
+# not the search form or the rest of the page.
+@st.fragment
+def tracer_panel():
+    st.subheader("📝 Word Tracer Generator")
+    if st.session_state.get('search_triggered') and 'matches' in st.session_state:
+        words_input = st.text_area("Enter words for practice (one per line):", value="\n".join(st.session_state['matches']), height=150)
+    else:
+        words_input = st.text_area("Enter words for practice (one per line):", height=150)
+    if st.button("Generate PDF"):
+        words_for_tracer = [w.strip() for w in words_input.split('\n') if w.strip()]
+        if len(words_for_tracer) > TRACER_MAX_WORDS:
+            st.warning(f"Practice sheet limited to the first {TRACER_MAX_WORDS} of {len(words_for_tracer)} words.")
+            words_for_tracer = words_for_tracer[:TRACER_MAX_WORDS]
+        if words_for_tracer:
+            words_key = tuple(words_for_tracer)
+            pdf_data = cached_tracer_pdf(words_key)
+            if pdf_data is None:
+                # reportlab runs on pdf_pool and only bumps a counter; the script thread polls it and owns the bar.
+                progress_bar = st.progress(0.0, text="Building practice sheet...")
+                done = [0]
+                fut = pdf_pool().submit(create_tracer_pdf_buffer, words_key, lambda i: done.__setitem__(0, i+1))
+                while wait([fut], timeout=0.1).not_done:
+                    progress_bar.progress(done[0]/len(words_key), text="Building practice sheet...")
+                pdf_data = fut.result().getvalue()
+                store_tracer_pdf(words_key, pdf_data)
+                progress_bar.empty()
+            st.download_button("Download Practice Sheet as PDF", data=pdf_data, file_name="word_tracer_sheet.pdf", mime="application/pdf")
+
+@st.fragment
+def definitions_panel():
     st.subheader("📘 Word Definitions")
     lang_choice = st.selectbox("Show Meaning in:", ["English Only","Tamil Only","English + Tamil"])
+    def_limit = st.number_input("Words per page", min_value=10, max_value=5000, step=10, value=200)
 
     if st.session_state.get('search_triggered') and 'matches' in st.session_state:
         matches = st.session_state['matches']
         if matches:
-            data_rows=[]
-            def build_rows(word):
-                info = aggregate_meanings(word)
-                pos = ", ".join(info.get("pos") or []) if info.get("pos") else "-"
-                defs = info.get("definitions") or []
-                syns = ", ".join(info.get("synonyms") or []) if info.get("synonyms") else "-"
-                if not defs:
-                    return [{"Word":word,"Word Type":pos,"English":"-","Tamil":"-","Synonyms":syns}]
-                rows=[]
-                for d in defs:
-                    rows.append({"Word":word,"Word Type":pos,"English":d,"Tamil":"","Synonyms":syns})
-                return rows
-
-            with ThreadPoolExecutor(max_workers=12) as ex:
-                futs = [ex.submit(build_rows, w) for w in matches]
-                for f in as_completed(futs):
-                    data_rows.extend(f.result())
-
-            df_export=pd.DataFrame(data_rows)
-
-            # Translate if needed
-            if lang_choice in ["Tamil Only","English + Tamil"]:
-                eng_defs = df_export["English"].fillna("").astype(str).tolist()
-                df_export["Tamil"] = translate_list_parallel(eng_defs)
+            # The table looks up and translates only the selected page; pages already seen come from build_definitions_df's cache.
+            n_pages = -(-len(matches)//def_limit)
+            page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1, value=1) if n_pages > 1 else 1
+            start = (page-1)*def_limit
+            matches = matches[start:start+def_limit]
+            if n_pages > 1:
+                st.caption(f"Showing definitions for words {start+1}–{start+len(matches)} of {len(st.session_state['matches'])}.")
+            df_export = unless_incomplete(build_definitions_df, tuple(matches), lang_choice)
 
             # Build view
             if lang_choice=="English Only":
@@ -289,19 +572,50 @@ with st.container():
             else:
                 df_view=df_export[["Word","Word Type","English","Tamil","Synonyms"]]
 
-            for col in df_view.columns:
-                df_view[col]=df_view[col].replace("", "-").fillna("-")
+            # One pass over the whole frame; it returns a new frame, so the cached one is never touched.
+            df_view=df_view.replace("", "-").fillna("-")
 
             st.dataframe(df_view,height=450,use_container_width=True)
 
             # Download Excel WITHOUT Sources
-            towrite=BytesIO()
-            with pd.ExcelWriter(towrite, engine="openpyxl") as writer:
-                df_export.drop(columns=["Sources"], errors="ignore").to_excel(writer,index=False,sheet_name="Meanings")
-            towrite.seek(0)
-            st.download_button("📥 Download as EXCEL SHEET", towrite, file_name="all_meanings.xlsx")
+            # Passing a callable defers building the workbook until the button is actually clicked.
+            # The export covers the matches beyond the page on screen, up to EXPORT_MAX_WORDS; the label says which.
+            all_matches = st.session_state['matches']
+            if len(all_matches) > EXPORT_MAX_WORDS:
+                label = f"📥 Download first {EXPORT_MAX_WORDS} of {len(all_matches)} words as EXCEL SHEET"
+            else:
+                label = f"📥 Download all {len(all_matches)} words as EXCEL SHEET" if n_pages > 1 else "📥 Download as EXCEL SHEET"
+            st.download_button(label, partial(unless_incomplete, definitions_xlsx, tuple(all_matches[:EXPORT_MAX_WORDS]), lang_choice),
+                               file_name="all_meanings.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", on_click="ignore")
         else:
             st.info("No results found.")
     else:
         st.info("Please enter a suffix and click 'Apply' to see definitions.")
+
+st.markdown("<div class='app-header'><h1 style='margin:0'>BRAIN-CHILD DICTIONARY</h1><small>Learn spellings and master words with suffixes and meanings</small></div>", unsafe_allow_html=True)
+
+with st.container():
+    st.markdown("<div class='main-container'>", unsafe_allow_html=True)
+    col1,col2 = st.columns(2,gap="large")
+
+    # --- Find Words ---
+    with col1:
+        st.subheader("🔎 Find Words")
+        with st.form("find_words_form"):
+            suffix_input = st.text_input("Suffix (e.g., 'ight', or several: 'ight, ought')", value="ight")
+            before_letters = st.number_input("Letters Before Suffix (0 for any number)", min_value=0, step=1, value=0)
+            submit_button = st.form_submit_button("Apply")
+            if submit_button:
+                matches = find_matches(suffix_input, before_letters)
+                st.session_state['matches']=matches; st.session_state['search_triggered']=True
+                st.markdown(f"**Total Words Found:** {len(matches)}")
+                if matches: st.dataframe({"Word": matches},height=450,use_container_width=True)
+                else: st.info("No results found.")
+
+    # --- Word Tracer PDF ---
+    with col2:
+        tracer_panel()
+
+    st.markdown("---")
+    definitions_panel()
     st.markdown("</div>", unsafe_allow_html=True)